@@ -1,18 +1,42 @@
 #!/usr/bin/env python3
 
 import json
-import os.path
+import os
 import pickle
+import sys
+import threading
 import time
+from collections import defaultdict
+from concurrent.futures import (FIRST_COMPLETED, CancelledError,
+                                ThreadPoolExecutor, wait)
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
-from random import choice
-from unittest import TestLoader, TestResult
+from random import sample, shuffle, uniform
+from unittest import TestLoader, TestResult, TestSuite
 
-import yaml
-from textmagic.rest import TextmagicRestClient
+try:
+    # orjson parses json considerably faster, but is optional
+    from orjson import loads as loadJson
+except ImportError:
+    from json import loads as loadJson
 
+# The first bytes of a list pickled with protocol 2 or later (PROTO opcode),
+# protocol 1 (EMPTY_LIST) and protocol 0 (MARK followed by LIST), as in the
+# save files from the years before they were saved as json. Only used to tell
+# pickle files from json files
+PICKLED_LIST_HEADERS = (b'\x80', b']', b'(l')
 
-def main(sendTextMessages=False, nPreviousSaveFiles=1):
+# Number of previous years whose receivers can't be given to the same secret
+# santa again. Also used by the unit tests to check the saved file
+N_PREVIOUS_SAVE_FILES = 4
+
+# Text message sent to every secret santa
+MSG_TEMPLATE = "Hej {santa}!\n\nDin hemliga julklappsmottagare är: {receiver} \n\nGod Jul önskar Tomten!"
+
+
+def main(sendTextMessages=False, nPreviousSaveFiles=N_PREVIOUS_SAVE_FILES,
+         fullTest=False):
     """
     # main
 
@@ -27,6 +51,9 @@ def main(sendTextMessages=False, nPreviousSaveFiles=1):
     - nPreviousSaveFiles states how many save files from previous years to
       search for when excluding secret santa receivers from previous years
 
+    - If fullTest is set to True the unit tests are also run on the saved file,
+      in addition to the verification of the generated secret santas
+
     Return: Name of file containing the secret santas
     """
     print('\n================== Random Secret Santa ==================')
@@ -41,13 +68,17 @@ def main(sendTextMessages=False, nPreviousSaveFiles=1):
     secretSanta = randomizeSecretSanta(families, previousSecretSanta)
 
     # Save the result to file if it needs to be reused later
-    with open(savefile, "wb") as f:
-        pickle.dump(secretSanta, f)
+    with open(savefile, "w") as f:
+        json.dump(secretSanta, f)
     print('Secret santa saved to: \'{}\''.format(savefile))
 
-    # Run unittests on the saved file
-    print('Verifying secret santa file')
-    testSuccessful = runUnitTestOnSavedFile()
+    # Verify the generated secret santa, and if requested also run the unit
+    # tests on the saved file
+    print('Verifying secret santa')
+    testSuccessful = verifySecretSanta(secretSanta, families, previousSecretSanta)
+    if testSuccessful and fullTest:
+        print('Verifying secret santa file')
+        testSuccessful = runUnitTestOnSavedFile()
     if not testSuccessful:
         print('Verification failed')
         print('================== FAILED ==================')
@@ -61,32 +92,76 @@ def main(sendTextMessages=False, nPreviousSaveFiles=1):
 
         # Send text message to all secret santa
         print('Sending {} text messages: '.format(len(secretSanta)), end='')
-        for pair in secretSanta:
-            print('#', end='')
-            sendTextMessageToSecretSanta(
-                client, phonenumbers[pair[0]], pair[0], pair[1])
-            # Wait for 1s to not spam the message service
-            time.sleep(1)
+        sendTextMessagesToAllSecretSantas(client, phonenumbers, secretSanta)
         print(' Done')
     print('================== Finished successfully ==================')
     return savefile
 
 
 def getSecretSantasFromPreviousYears(previousSavefiles):
-    previousSecretSanta = {}
+    """
+    # getSecretSantasFromPreviousYears
+
+    Function that returns a dict with the receivers every secret santa has had
+    in the previous years, e.g. {"santa_1": frozenset({"receiver_1", ...}), ...}
+    """
+    # List the files in the working directory once, instead of checking every
+    # save file separately
+    with os.scandir('.') as entries:
+        existingFiles = {entry.name for entry in entries if entry.is_file()}
+
+    previousSecretSanta = defaultdict(set)
     for fileName in previousSavefiles:
-        if os.path.isfile(fileName):
-            with open(fileName, "rb") as f:
-                secretSantas = pickle.load(f)
+        if fileName in existingFiles:
+            secretSantas = loadSecretSantaFile(fileName)
             print(
             'Found secret santa from previous year: \'{}\''
             ''.format(fileName))
-            for pair in secretSantas:
-                if pair[0] in previousSecretSanta:
-                    previousSecretSanta[pair[0]] += [pair[1]]
-                else:
-                    previousSecretSanta[pair[0]] = [pair[1]]
-    return previousSecretSanta
+            for santa, receiver in secretSantas.items():
+                previousSecretSanta[santa].add(receiver)
+    return {santa: frozenset(receivers)
+            for santa, receivers in previousSecretSanta.items()}
+
+
+def loadSecretSantaFile(fileName):
+    """
+    # loadSecretSantaFile
+
+    Function that returns the secret santa dict saved in a file by main.
+
+    The secret santas are saved as json, but files from earlier years were
+    saved using pickle and are still read so that they can be excluded. Those
+    files contain a list of [santa, receiver] pairs, which is converted to a
+    dict.
+
+    Files that start like a pickled list are read with SaveFileUnpickler,
+    which refuses to load any class or function, and any other file has to be
+    valid json.
+    """
+    with open(fileName, "rb") as f:
+        data = f.read()
+    if data.startswith(PICKLED_LIST_HEADERS):
+        secretSanta = SaveFileUnpickler(BytesIO(data)).load()
+    else:
+        secretSanta = loadJson(data)
+    if isinstance(secretSanta, list):
+        secretSanta = dict(secretSanta)
+    return secretSanta
+
+
+class SaveFileUnpickler(pickle.Unpickler):
+    """
+    # SaveFileUnpickler
+
+    Unpickler for the old save files. They only contain lists and strings,
+    which are unpickled without looking up any globals, so every global is
+    refused. This stops a pickle from calling e.g. os.system when it's loaded.
+    """
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(
+            "Global '{}.{}' is not allowed in a secret santa file"
+            "".format(module, name))
 
 
 def getSaveFileNames(nPreviousSaveFiles: int=1):
@@ -111,10 +186,25 @@ def getFamilyData():
 
     Function that returns family data read from a json file
     """
-    # Nested list with all families
-    with open("family_data.json") as json_file:
-        data = json.load(json_file)
-    return data["families"], data["phonenumbers"]
+    # Nested list with all families. The cached data is shared between all
+    # calls, so return copies the caller can modify
+    families, phonenumbers = readFamilyData()
+    return [list(family) for family in families], dict(phonenumbers)
+
+
+@lru_cache(maxsize=1)
+def readFamilyData():
+    """
+    # readFamilyData
+
+    Function that reads the family data json file the first time it's called,
+    and returns the same data on the following calls. The families are returned
+    as tuples and the phone numbers as a tuple of (name, phonenumber) pairs, so
+    that the cached data cannot be modified.
+    """
+    data = loadJson(Path("family_data.json").read_bytes())
+    families = tuple(tuple(family) for family in data["families"])
+    return families, tuple(data["phonenumbers"].items())
 
 
 def randomizeSecretSanta(families, previousSecretSanta={}):
@@ -122,59 +212,105 @@ def randomizeSecretSanta(families, previousSecretSanta={}):
     # randomizeSecretSanta
 
     Function that takes a nested list of families as input, where the sub lists contains
-    people that should not get each other as secret santa.
-
-    Outputs a nested list with names and for whom they are secret santa, e.g in the following format:
-    [["santa_1","receiver_1"],["santa_2","receiver_2"],...,["santa_n","receiver_n"]]]
-    """
-    tries = 0
-    randomizationSuccessful = False
-    while not randomizationSuccessful and tries < 10:
-        secretSanta = []
-        availableReceivers = []
-        for family in families:
-            # Create a list that only contain members from other families
-            otherFamilies = families.copy()
-            otherFamilies.remove(family)
-            # Flatten the list
-            otherFamilies = [
-                item for sublist in otherFamilies for item in sublist]
-            for member in family:
-                # Remove people who already have a designated secret santa (the second person is the receiver)
-                availableReceivers = list(
-                    set(otherFamilies) - set([pair[1] for pair in secretSanta])
-                )
-                # If there is a previous secret santa list, remove the secret santa that the person
-                # had as receiver last year
-                if previousSecretSanta:
-                    if member in previousSecretSanta:
-                        for previousReceiver in previousSecretSanta[member]:
-                            if previousReceiver in availableReceivers:
-                                availableReceivers.remove(previousReceiver)
-                if len(availableReceivers) == 0:
-                    # There are no available choices left. This can only happen if a member in the last
-                    # family has not yet been randomly selected when it's time for the last member in the last
-                    # family to get a randomly selected receiver. In this case we need to restart
-                    # the whole randomizer.
-                    randomizationSuccessful = False
-                    print('Secret santa randomization failed. Trying again.')
-                    break
-                else:
-                    # Generate a random receiver
-                    receiver = choice(availableReceivers)
-                    randomizationSuccessful = True
-                # Add the secret santa and receiver as a pair to the secretSanta list
-                secretSanta.append([member, receiver])
-            else:
-                continue  # only executed if the inner loop did NOT break
-            break  # only executed if the inner loop DID break
-        tries += 1
-    if tries == 10:
-        raise Exception(
-            "randomizeSecretSanta",
-            "Randomization failed. The maximum number of tries was reached",
-        )
-    return secretSanta
+    people that should not get each other as secret santa. previousSecretSanta is a dict
+    with the receivers from previous years, as returned by getSecretSantasFromPreviousYears.
+    The receivers of a santa may be given as any collection, e.g. a list or a frozenset.
+
+    Outputs a dict with names and for whom they are secret santa, e.g in the following format:
+    {"santa_1": "receiver_1", "santa_2": "receiver_2", ..., "santa_n": "receiver_n"}
+    """
+    # Flatten the families once, and map every person to the members of their
+    # own family. All members of a family share the same frozenset
+    people = [person for family in families for person in family]
+    allPeople = frozenset(people)
+    ownFamily = {person: family
+                 for family in map(frozenset, families) for person in family}
+
+    # The possible receivers for a person are all people in the other families,
+    # except the receivers the person had in previous years
+    domains = {}
+    for person in allPeople:
+        domains[person] = (allPeople - ownFamily[person]
+                           - frozenset(previousSecretSanta.get(person, ())))
+
+    # Finding the secret santas is a perfect matching between the santas and
+    # the receivers in their domains. Start with a random assignment of the
+    # receivers and keep the pairs that fulfill the requirements
+    santaOf = {}
+    for santa, receiver in zip(people, sample(people, k=len(people))):
+        if receiver in domains[santa]:
+            santaOf[receiver] = santa
+
+    # Find a receiver for the remaining santas
+    matchedSantas = set(santaOf.values())
+    for santa in people:
+        if santa in matchedSantas:
+            continue
+        if not findReceiver(santa, domains, santaOf):
+            # If no receiver can be found for a santa now, there is no
+            # perfect matching at all
+            raise Exception(
+                "randomizeSecretSanta",
+                "Randomization failed. No secret santa assignment fulfills the requirements",
+            )
+
+    receiverOf = {santa: receiver for receiver, santa in santaOf.items()}
+    return {santa: receiverOf[santa] for santa in people}
+
+
+def findReceiver(santa, domains, santaOf):
+    """
+    # findReceiver
+
+    Function that tries to find a receiver for santa among the receivers in
+    domains[santa]. If they all already have a secret santa, it instead tries
+    to move one of those secret santas to another receiver, which in turn may
+    move another secret santa, and so on (an augmenting path).
+
+    santaOf is a dict with the secret santa for every receiver that has one,
+    and is updated with the new assignments.
+
+    The path is searched depth first with an explicit stack, since it can be
+    as long as the number of people and would hit the recursion limit.
+
+    Returns True if a receiver was found
+    """
+    # Receivers that have already been tried while looking for this santa's
+    # receiver
+    visited = set()
+
+    def receiversToTry(santa):
+        receivers = list(domains[santa] - visited)
+        # Try the receivers in random order
+        shuffle(receivers)
+        return iter(receivers)
+
+    # The santas on the path with the receivers they have left to try, and the
+    # receiver each of them takes over from the next santa on the path
+    stack = [(santa, receiversToTry(santa))]
+    path = []
+    while stack:
+        currentSanta, receivers = stack[-1]
+        # The receiver may have been tried further down the path
+        receiver = next((receiver for receiver in receivers
+                         if receiver not in visited), None)
+        if receiver is None:
+            # No receivers left to try for this santa, go back one step
+            stack.pop()
+            if path:
+                path.pop()
+            continue
+        visited.add(receiver)
+        path.append(receiver)
+        if receiver not in santaOf:
+            # A free receiver was found. Every santa on the path takes the
+            # receiver of the next santa, and the last one takes the free one
+            for (pathSanta, _), pathReceiver in zip(stack, path):
+                santaOf[pathReceiver] = pathSanta
+            return True
+        nextSanta = santaOf[receiver]
+        stack.append((nextSanta, receiversToTry(nextSanta)))
+    return False
 
 
 def get_settings():
@@ -183,9 +319,17 @@ def get_settings():
 
     Function that returns a dict with settings read from a yaml-file
     """
+    # Imported here as it's only needed when text messages are sent
+    import yaml
+    try:
+        # Use the LibYAML based loader if PyYAML was built with it
+        from yaml import CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeLoader as Loader
+
     full_file_path = Path(__file__).parent.joinpath("settings.yaml")
     with open(full_file_path) as settings:
-        settings_data = yaml.load(settings, Loader=yaml.Loader)
+        settings_data = yaml.load(settings, Loader=Loader)
     return settings_data
 
 
@@ -195,25 +339,184 @@ def initiateTextMessageClient(settings):
 
     Function that initiates the connection with the text messaging service
     """
+    # Imported here so that a dry run does not pay for loading the client
+    # and its HTTP dependencies
+    from textmagic.rest import TextmagicRestClient
+
     username = settings["username"]
     token = settings["token"]
     client = TextmagicRestClient(username, token)
     return client
 
 
-def sendTextMessageToSecretSanta(client, phonenumber, secretSanta, receiver):
+def sendTextMessageToSecretSanta(client, phonenumber, secretSanta, receiver,
+                                 rateLimiter=None):
     """
     # sendTextMessageToSecretSanta
 
     Function that sends a text message to the secret santa, informing about who
     that person is secret santa for.
+
+    If a rateLimiter is given, the message is not started before the
+    rateLimiter allows it.
     """
-    message = client.messages.create(
+    text = MSG_TEMPLATE.format(santa=secretSanta, receiver=receiver)
+    message = sendWithBackoff(lambda: client.messages.create(
         phones=phonenumber,
-        text="Hej {}!\n\nDin hemliga julklappsmottagare är: {} \n\nGod Jul önskar Tomten!".format(
-            secretSanta, receiver
-        ),
-    )
+        text=text,
+    ), rateLimiter=rateLimiter)
+
+
+class RateLimiter:
+    """
+    # RateLimiter
+
+    Class that makes sure that the text messages sent from several threads are
+    started at least interval seconds apart. The time is taken when a message
+    is actually started, not when it's handed to a thread.
+
+    After stop() has been called no more messages are allowed to start.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.nextSendTime = time.monotonic()
+        self.stopped = False
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """
+        Wait until the next message is allowed to start. Returns False if
+        the rate limiter was stopped while waiting, and True otherwise
+        """
+        while True:
+            with self.lock:
+                if self.stopped:
+                    return False
+                now = time.monotonic()
+                if now >= self.nextSendTime:
+                    self.nextSendTime = now + self.interval
+                    return True
+                waitTime = self.nextSendTime - now
+            # Sleep outside the lock and check again, since the next send
+            # time may have been moved or the rate limiter stopped
+            time.sleep(min(waitTime, self.interval))
+
+    def delay(self, seconds):
+        """
+        Postpone all following messages until seconds from now, e.g. when the
+        message service throttles the messages
+        """
+        with self.lock:
+            self.nextSendTime = max(self.nextSendTime,
+                                    time.monotonic() + seconds)
+
+    def stop(self):
+        with self.lock:
+            self.stopped = True
+
+
+def sendWithBackoff(send, maxAttempts=5, baseDelay=1.0, maxDelay=30.0,
+                    rateLimiter=None):
+    """
+    # sendWithBackoff
+
+    Function that calls send and retries it if the connection to the message
+    service fails or the service throttles the request (status 429). In both
+    cases the message has not been accepted, so a retry cannot send it twice.
+    Timeouts and server errors are not retried, since the message may already
+    have been sent.
+
+    Between the attempts it waits with exponential backoff plus a random jitter,
+    so that retries do not hit the service at the same rate that failed. All
+    other errors, e.g. a bad token or phone number, are raised directly, as is
+    the last error when maxAttempts is reached.
+
+    If a rateLimiter is given every attempt also waits for it, and the backoff
+    postpones the rateLimiter, so that the other threads also hold back while
+    the service is throttling. If it's stopped a CancelledError is raised
+    without calling send.
+    """
+    # Imported here, like the text message client, so that a dry run does not
+    # load them
+    from requests.exceptions import ConnectionError
+    from textmagic.rest.models.base import TextmagicRestException
+
+    for attempt in range(maxAttempts):
+        lastAttempt = attempt == maxAttempts - 1
+        if rateLimiter is not None and not rateLimiter.wait():
+            raise CancelledError()
+        try:
+            return send()
+        except ConnectionError:
+            if lastAttempt:
+                raise
+        except TextmagicRestException as error:
+            if getattr(error, 'status', None) != 429 or lastAttempt:
+                raise
+        backoff = min(maxDelay, baseDelay * 2**attempt) + uniform(0, 1.0)
+        if rateLimiter is not None:
+            rateLimiter.delay(backoff)
+        else:
+            time.sleep(backoff)
+
+
+def sendTextMessagesToAllSecretSantas(client, phonenumbers, secretSanta,
+                                      interval=1.0):
+    """
+    # sendTextMessagesToAllSecretSantas
+
+    Function that sends a text message to every secret santa in the secretSanta
+    dict.
+
+    To not spam the message service a new message, or a new attempt of a
+    message, is only started every interval seconds. The messages are sent from
+    a thread pool, so the wait for the next message overlaps with the request
+    for the previous one instead of being added to it.
+
+    When a message fails no more messages are started, the messages that have
+    not started yet are cancelled, and an exception naming every secret santa
+    whose message failed is raised.
+    """
+    rateLimiter = RateLimiter(interval)
+    sentSantas = []
+    failedMessages = {}
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        sendingMessages = {
+            executor.submit(sendTextMessageToSecretSanta,
+                            client, phonenumbers[santa], santa, receiver,
+                            rateLimiter): santa
+            for santa, receiver in secretSanta.items()}
+        while sendingMessages:
+            finishedMessages = wait(sendingMessages,
+                                    return_when=FIRST_COMPLETED)[0]
+            for message in finishedMessages:
+                santa = sendingMessages.pop(message)
+                if message.cancelled():
+                    continue
+                error = message.exception()
+                if error is None:
+                    sentSantas.append(santa)
+                    print('#', end='', flush=True)
+                elif not isinstance(error, CancelledError):
+                    failedMessages[santa] = error
+            if failedMessages:
+                # Stop the messages that are waiting to start, and cancel the
+                # ones that are waiting for a free thread
+                rateLimiter.stop()
+                for message in sendingMessages:
+                    message.cancel()
+
+    if failedMessages:
+        raise Exception(
+            "sendTextMessagesToAllSecretSantas",
+            "Sending the text message failed for: {}. {} of {} text messages "
+            "were sent".format(
+                ', '.join('{} ({!r})'.format(santa, error)
+                          for santa, error in failedMessages.items()),
+                len(sentSantas), len(secretSanta)),
+        ) from next(iter(failedMessages.values()))
 
 
 def sendTextMessageFromFile(
@@ -222,21 +525,61 @@ def sendTextMessageFromFile(
     # sendTextMessageFromFile
 
     Function that can be used to send text message to a secret santa, using an 
-    old randomization stored in a file using pickle
+    old randomization stored in a file
     """
     # Load the secretSanta variable from the provided filename
-    with open(filename, "rb") as f:
-        secretSanta = pickle.load(f)
-    # Initiate text message client
-    client = initiateTextMessageClient()
+    secretSanta = loadSecretSantaFile(filename)
     # Find the receiver for the secret santa
-    receiver = [pair[1]
-                for pair in secretSanta if pair[0] == textMessageRecipant][0]
+    receiver = secretSanta[textMessageRecipant]
+    # Initiate text message client
+    client = initiateTextMessageClient(get_settings())
     # Send text message to the secret santa
     sendTextMessageToSecretSanta(
         client, phonenumber, textMessageRecipant, receiver)
 
 
+def verifySecretSanta(secretSanta, families, previousSecretSanta={}):
+    """
+    # verifySecretSanta
+
+    Function that verifies that the secret santa dict is following the same
+    rules as the unit tests check on the saved file: every person is secret
+    santa for exactly one person and receives from exactly one person, and no
+    one is secret santa for themself, someone in their own family or any of
+    their receivers from previous years.
+
+    The function returns a boolean stating if all rules are followed or not
+    """
+    allPeople = {person for family in families for person in family}
+    ownFamily = {person: family
+                 for family in map(frozenset, families) for person in family}
+    receivers = list(secretSanta.values())
+
+    errors = []
+    if set(secretSanta) != allPeople:
+        errors.append('Not every person is a secret santa')
+    if len(set(receivers)) != len(receivers) or set(receivers) != allPeople:
+        errors.append('Not every person has exactly one secret santa')
+    for santa, receiver in secretSanta.items():
+        # The own family also includes the santa
+        if receiver in ownFamily.get(santa, ()):
+            errors.append('{} is secret santa for {} in the same family'
+                          ''.format(santa, receiver))
+        if receiver in previousSecretSanta.get(santa, ()):
+            errors.append('{} was secret santa for {} a previous year'
+                          ''.format(santa, receiver))
+
+    if errors:
+        print('Verification of secret santa failed:')
+        for error in errors:
+            print(error)
+    return not errors
+
+
+# Names of the tests found the first time runUnitTestOnSavedFile is called
+_TEST_NAMES = None
+
+
 def runUnitTestOnSavedFile():
     """
     # runUnitTestOnSavedFile
@@ -244,16 +587,29 @@ def runUnitTestOnSavedFile():
     Function that runs unit tests to verify that the file with secret 
     santa is following all the rules specified in the tests.
 
+    The test directory is only searched for tests the first time the function
+    is called. The names of the tests that were found are reused on the
+    following calls.
+
     The function returns a boolean stating if all tests have passed or not
     """
+    global _TEST_NAMES
     test_loader = TestLoader()
     test_result = TestResult()
 
-    # Use resolve() to get an absolute path
-    # https://docs.python.org/3/library/pathlib.html#pathlib.Path.resolve
-    test_directory = str(Path(__file__).resolve().parent)
-
-    test_suite = test_loader.discover(test_directory, pattern='test_*.py')
+    if _TEST_NAMES is None:
+        # Use resolve() to get an absolute path
+        # https://docs.python.org/3/library/pathlib.html#pathlib.Path.resolve
+        test_directory = str(Path(__file__).resolve().parent)
+
+        test_suite = test_loader.discover(test_directory, pattern='test_*.py')
+        # A suite removes its tests when it has run, so save the test names
+        # and load them again instead of saving the suite. Don't save them if
+        # a test file could not be imported, so that it's reported every time
+        if not test_loader.errors:
+            _TEST_NAMES = getTestNames(test_suite)
+    else:
+        test_suite = test_loader.loadTestsFromNames(_TEST_NAMES)
     test_suite.run(result=test_result)
 
     # See the docs for details on the TestResult object
@@ -270,37 +626,54 @@ def runUnitTestOnSavedFile():
                 print(message)
         return False
 
+def getTestNames(test_suite):
+    """
+    # getTestNames
+
+    Function that returns the names of all tests in a, possibly nested, test
+    suite
+    """
+    test_names = []
+    for test in test_suite:
+        if isinstance(test, TestSuite):
+            test_names += getTestNames(test)
+        else:
+            test_names.append(test.id())
+    return test_names
+
+
 def printReceiversFromFile(saved_file: str, secretSantaReceiversToPrint: list=[]):
     """
     # printReceiversFromFile
     Function that prints secret santa receivers from a loaded file.
     
-    secretSantaReceiversToPrint contains a list of secret santa pairs for the
-    receiver names in the list will be printed. If left empty, all secret
-    santas will be printed out.
+    secretSantaReceiversToPrint contains a list of receiver names, and the
+    secret santa pairs for exactly those receivers will be printed. If left
+    empty, all secret santas will be printed out.
     """
 
     # Look for file with secret santas for previous year
-    with open(saved_file, "rb") as f:
-        randomizedSecretSanta = pickle.load(f)
+    randomizedSecretSanta = loadSecretSantaFile(saved_file)
 
-    print_all_names = False
     if secretSantaReceiversToPrint == []:
-        print_all_names = True
+        for santa, receiver in randomizedSecretSanta.items():
+            print('{} is secret santa for {}'.format(santa, receiver))
+        return
 
-    for pair in randomizedSecretSanta:
-        if print_all_names:
-            print('{} is secret santa for {}'.format(pair[0], pair[1]))
-        else:
-            for name in secretSantaReceiversToPrint:
-                if name in pair[1]:
-                    print('{} is secret santa for {}'.format(pair[0], pair[1]))
+    # Map every receiver to their secret santa, to look up the names directly
+    santaOf = {receiver: santa
+               for santa, receiver in randomizedSecretSanta.items()}
+    for name in secretSantaReceiversToPrint:
+        if name in santaOf:
+            print('{} is secret santa for {}'.format(santaOf[name], name))
 
 if __name__ == "__main__":
     # Set live_run to true when testing is complete and text messages shall be
     # sent to all secret santas
     live_run = False
-    savefile = main(sendTextMessages=live_run, nPreviousSaveFiles=4)
+    # Run with --full-test to also run the unit tests on the saved file
+    full_test = "--full-test" in sys.argv
+    savefile = main(sendTextMessages=live_run, fullTest=full_test)
     if not live_run:
         print("\nResults:")
         printReceiversFromFile(savefile)
\ No newline at end of file
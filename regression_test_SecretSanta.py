@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the randomization in SecretSanta.py
+
+These tests don't use the family data or the saved files, and the file is
+named so that runUnitTestOnSavedFile doesn't pick it up. Run them with:
+python -m unittest regression_test_SecretSanta
+"""
+import unittest
+
+target = __import__("SecretSanta")
+randomizeSecretSanta = target.randomizeSecretSanta
+verifySecretSanta = target.verifySecretSanta
+
+
+class TestRandomizeSecretSanta(unittest.TestCase):
+
+    def test_infeasible_families_raises(self):
+        """
+        Test that the randomization fails when no assignment is possible. The
+        three people in the large family can only give to the fourth person
+        """
+        with self.assertRaises(Exception):
+            randomizeSecretSanta([["A", "B", "C"], ["D"]])
+
+    def test_infeasible_previous_years_raises(self):
+        """
+        Test that the randomization fails when the previous years leave no
+        possible receiver for a secret santa
+        """
+        with self.assertRaises(Exception):
+            randomizeSecretSanta([["A"], ["B"], ["C"]], {"A": ["B", "C"]})
+
+    def test_large_input_is_valid(self):
+        """
+        Test that a large number of families is randomized without hitting
+        the recursion limit, and that the result follows all rules
+        """
+        families = [["Person{}a".format(i), "Person{}b".format(i)]
+                    for i in range(2000)]
+        # Every person had the first person of the next family a previous year
+        previousSecretSanta = {
+            person: frozenset([families[(i + 1) % len(families)][0]])
+            for i, family in enumerate(families) for person in family}
+
+        secretSanta = randomizeSecretSanta(families, previousSecretSanta)
+        self.assertTrue(
+            verifySecretSanta(secretSanta, families, previousSecretSanta))
+
+    def test_previous_years_are_excluded(self):
+        """
+        Test that receivers from previous years are never given again. With
+        A excluded from giving to B, the only possible assignment is
+        A -> C -> B -> A. The receivers may be given as a list or a frozenset
+        """
+        families = [["A"], ["B"], ["C"]]
+        expected = {"A": "C", "B": "A", "C": "B"}
+        for previousSecretSanta in ({"A": ["B"]}, {"A": frozenset(["B"])}):
+            with self.subTest(previousSecretSanta=previousSecretSanta):
+                # The first assignment is random, so repeat the randomization
+                for _ in range(20):
+                    secretSanta = randomizeSecretSanta(
+                        families, previousSecretSanta)
+                    self.assertEqual(secretSanta, expected)
+